@@ -5,10 +5,20 @@ Matches the HTML neon splash design: dark gradient, purple glow,
 app icon, NOMO title with glow, tagline, loading bar.
 
 Output: ios/App/App/Assets.xcassets/LaunchSplash.imageset/ (1x, 2x, 3x)
+
+PNGs are written with fast compression by default; set SPLASH_OPTIMIZE=1
+(or true/yes/on) to produce the smallest files when regenerating the
+shipped assets. Any other value, including 0/false or empty, leaves it off.
+Generation is skipped when the script, icon, fonts and options are
+unchanged since the last run (tracked in .splash.cachekey).
 """
 
+import hashlib
 import os
 import math
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+import numpy as np
 from PIL import Image, ImageDraw, ImageFont, ImageFilter
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -31,67 +41,100 @@ FONT_BOLD = '/usr/share/fonts/truetype/liberation/LiberationSans-Bold.ttf'
 FONT_REG  = '/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf'
 ICON_PATH = os.path.join(PROJECT_ROOT, 'public', 'app-icon.png')
 
+OUT_DIR = os.path.join(
+    PROJECT_ROOT, 'ios', 'App', 'App',
+    'Assets.xcassets', 'LaunchSplash.imageset'
+)
+OUT_FILES = ('splash-1x.png', 'splash-2x.png', 'splash-3x.png', 'Contents.json')
+CACHE_KEY_PATH = os.path.join(OUT_DIR, '.splash.cachekey')
+
 
 def lerp_color(c1, c2, t):
-    """Linear interpolate between two RGB tuples."""
-    return tuple(int(a + (b - a) * t) for a, b in zip(c1, c2))
+    """Linear interpolate between two RGB tuples for an array of t values.
+
+    Returns a float32 array of shape t.shape + (3,).
+    """
+    c1 = np.asarray(c1, dtype=np.float32)
+    c2 = np.asarray(c2, dtype=np.float32)
+    return c1 + (c2 - c1) * np.asarray(t, dtype=np.float32)[..., None]
 
 
-def draw_gradient(img):
-    """Draw the vertical 3-stop gradient background."""
-    draw = ImageDraw.Draw(img)
+@lru_cache(maxsize=None)
+def load_font(path, size):
+    """Load a TrueType font once, falling back to Pillow's default."""
+    try:
+        return ImageFont.truetype(path, size)
+    except OSError:
+        return ImageFont.load_default()
+
+
+def blit_over(canvas, tile, x, y, opacity=1.0):
+    """Alpha-composite an RGBA tile onto the RGB canvas in place at (x, y)."""
+    tile = np.asarray(tile)
+    h, w = tile.shape[:2]
+    # Clip the tile to the canvas bounds
+    x0, y0 = max(x, 0), max(y, 0)
+    x1, y1 = min(x + w, canvas.shape[1]), min(y + h, canvas.shape[0])
+    if x0 >= x1 or y0 >= y1:
+        return
+    src = tile[y0 - y:y1 - y, x0 - x:x1 - x].astype(np.float32)
+    dst = canvas[y0:y1, x0:x1]
+    a = src[..., 3:] * (opacity / 255.0)
+    dst[...] = (src[..., :3] * a + dst * (1.0 - a) + 0.5).astype(np.uint8)
+
+
+def draw_gradient():
+    """Build the vertical 3-stop gradient background as an RGB canvas."""
     mid_y = int(H * 0.4)  # gradient midpoint at 40%
-    for y in range(H):
-        if y <= mid_y:
-            t = y / mid_y
-            color = lerp_color(BG_TOP, BG_MID, t)
-        else:
-            t = (y - mid_y) / (H - mid_y)
-            color = lerp_color(BG_MID, BG_BOT, t)
-        draw.line([(0, y), (W, y)], fill=color)
+    y = np.arange(H, dtype=np.float32)
+    rows = np.concatenate([
+        lerp_color(BG_TOP, BG_MID, y[:mid_y + 1] / mid_y),
+        lerp_color(BG_MID, BG_BOT, (y[mid_y + 1:] - mid_y) / (H - mid_y)),
+    ]).astype(np.uint8)
+    return np.broadcast_to(rows[:, None, :], (H, W, 3)).copy()
 
 
-def draw_glow(img):
+def draw_glow(canvas):
     """Draw the ambient purple glow circle (blurred)."""
-    glow = Image.new('RGBA', (W, H), (0, 0, 0, 0))
-    glow_draw = ImageDraw.Draw(glow)
     # Circle center at 30% from top (matching CSS: top:30%)
     cx, cy = W // 2, int(H * 0.30)
     radius = 450  # ~900px diameter at 3x
-    bbox = (cx - radius, cy - radius, cx + radius, cy + radius)
-    # Draw radial gradient by concentric circles
-    for r in range(radius, 0, -1):
-        t = 1.0 - (r / radius)  # 0 at edge, 1 at center
-        alpha = int(t * t * 80)  # quadratic falloff, max ~80/255
-        glow_draw.ellipse(
-            (cx - r, cy - r, cx + r, cy + r),
-            fill=(*PURPLE, alpha)
-        )
-    # Blur for extra softness
-    glow = glow.filter(ImageFilter.GaussianBlur(radius=60))
-    img.paste(Image.alpha_composite(
-        img.convert('RGBA'), glow
-    ))
-    return img
-
-
-def draw_scanlines(img):
+    # The glow is a low-frequency blob, so build and blur it at 1/4 scale
+    scale = 4
+    size = 2 * radius // scale
+    # Radial gradient computed analytically over the glow's bounding box
+    coords = (np.arange(size, dtype=np.float32) + 0.5) * scale - radius
+    yy, xx = coords[:, None], coords[None, :]
+    t = np.clip(1.0 - np.sqrt(xx * xx + yy * yy) / radius, 0, 1)  # 0 at edge, 1 at center
+    tile = np.empty((size, size, 4), dtype=np.uint8)
+    tile[..., :3] = PURPLE
+    tile[..., 3] = (t * t * 80).astype(np.uint8)  # quadratic falloff, max ~80/255
+    glow = Image.fromarray(tile, 'RGBA')
+    # Blur for extra softness. The tile needs no padding for blur bleed:
+    # the quadratic falloff keeps alpha near zero well inside the edge, so
+    # the blurred alpha still rounds to 0 at the tile boundary.
+    glow = glow.filter(ImageFilter.GaussianBlur(radius=60 / scale))
+    glow = glow.resize((2 * radius, 2 * radius), Image.BILINEAR)
+    blit_over(canvas, glow, cx - radius, cy - radius)
+
+
+def draw_scanlines(canvas):
     """Draw subtle horizontal scanlines overlay."""
-    overlay = Image.new('RGBA', (W, H), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(overlay)
-    for y in range(0, H, 4):
-        draw.line([(0, y + 2), (W, y + 2)], fill=(255, 255, 255, 2))
-        draw.line([(0, y + 3), (W, y + 3)], fill=(255, 255, 255, 2))
-    img = Image.alpha_composite(img.convert('RGBA'), overlay)
-    return img
+    # 2px white lines at alpha 2 on rows 2-3 of every 4-row period. The
+    # alpha is constant, so the blend reduces to a 256-entry lookup table.
+    v = np.arange(256, dtype=np.float32)
+    lut = (v + (255.0 - v) * (2 / 255.0) + 0.5).astype(np.uint8)
+    for offset in (2, 3):
+        canvas[offset::4] = lut[canvas[offset::4]]
 
 
-def draw_icon(img):
+def draw_icon(canvas):
     """Draw the app icon with rounded corners and shadow."""
     icon_size = 216  # 72px * 3x
     corner_radius = 48  # 16px * 3x
 
-    icon = Image.open(ICON_PATH).convert('RGBA')
+    # Alpha is replaced by the rounded-corner mask below, so only RGB is resampled
+    icon = Image.open(ICON_PATH).convert('RGB')
     icon = icon.resize((icon_size, icon_size), Image.LANCZOS)
 
     # Round corners
@@ -103,15 +146,18 @@ def draw_icon(img):
     )
     icon.putalpha(mask)
 
-    # Shadow
-    shadow = Image.new('RGBA', (icon_size + 60, icon_size + 60), (0, 0, 0, 0))
+    # Shadow: a soft low-frequency blob, so draw and blur it at 1/4 scale
+    scale = 4
+    shadow_size = icon_size + 60
+    shadow = Image.new('RGBA', (shadow_size // scale, shadow_size // scale), (0, 0, 0, 0))
     shadow_draw = ImageDraw.Draw(shadow)
     shadow_draw.rounded_rectangle(
-        (30, 30, icon_size + 30, icon_size + 30),
-        radius=corner_radius,
+        (30 / scale, 30 / scale, (icon_size + 30) / scale, (icon_size + 30) / scale),
+        radius=corner_radius / scale,
         fill=(147, 51, 234, 60)  # purple shadow
     )
-    shadow = shadow.filter(ImageFilter.GaussianBlur(radius=20))
+    shadow = shadow.filter(ImageFilter.GaussianBlur(radius=20 / scale))
+    shadow = shadow.resize((shadow_size, shadow_size), Image.BILINEAR)
 
     # Position: centered, above NOMO (at ~38% from top)
     icon_y = int(H * 0.34)
@@ -119,21 +165,16 @@ def draw_icon(img):
     shadow_x = icon_x - 30
     shadow_y = icon_y - 30
 
-    img.paste(shadow, (shadow_x, shadow_y), shadow)
-    img.paste(icon, (icon_x, icon_y), icon)
-    return img, icon_y + icon_size
+    blit_over(canvas, shadow, shadow_x, shadow_y)
+    blit_over(canvas, icon, icon_x, icon_y)
+    return icon_y + icon_size
 
 
-def draw_text(img, below_icon_y):
+def draw_text(canvas, below_icon_y):
     """Draw NOMO title, tagline."""
-    draw = ImageDraw.Draw(img)
-
     # NOMO title
     title_size = 156  # ~52px * 3x
-    try:
-        font_title = ImageFont.truetype(FONT_BOLD, title_size)
-    except:
-        font_title = ImageFont.load_default()
+    font_title = load_font(FONT_BOLD, title_size)
 
     title_text = "NOMO"
     bbox = font_title.getbbox(title_text)
@@ -154,41 +195,32 @@ def draw_text(img, below_icon_y):
     title_y = below_icon_y + 60  # 20px * 3x gap after icon
     title_x = (W - total_w) // 2
 
-    # Draw glow layers (multiple passes with offsets for shadow/glow)
-    glow_layer = Image.new('RGBA', (W, H), (0, 0, 0, 0))
-    glow_draw = ImageDraw.Draw(glow_layer)
-
-    # Purple glow (outer)
-    x = title_x
-    for i, ch in enumerate(title_text):
-        glow_draw.text((x, title_y), ch, fill=(*PURPLE, 100), font=font_title)
-        x += char_widths[i] + (spacing if i < len(title_text) - 1 else 0)
-    glow_layer = glow_layer.filter(ImageFilter.GaussianBlur(radius=30))
-    img = Image.alpha_composite(img.convert('RGBA'), glow_layer)
-
-    # Second glow pass (tighter)
-    glow_layer2 = Image.new('RGBA', (W, H), (0, 0, 0, 0))
-    glow_draw2 = ImageDraw.Draw(glow_layer2)
-    x = title_x
+    # Rasterize the spaced glyphs once into a padded mask around the title;
+    # the glow passes and the main text are colorized from this mask.
+    pad = 90  # room for the blur to bleed (~3x the outer radius)
+    tile_size = (total_w + 2 * pad, bbox[3] + 2 * pad)
+    glyph_mask = Image.new('L', tile_size, 0)
+    mask_draw = ImageDraw.Draw(glyph_mask)
+    x = pad
     for i, ch in enumerate(title_text):
-        glow_draw2.text((x, title_y), ch, fill=(*PURPLE, 140), font=font_title)
-        x += char_widths[i] + (spacing if i < len(title_text) - 1 else 0)
-    glow_layer2 = glow_layer2.filter(ImageFilter.GaussianBlur(radius=12))
-    img = Image.alpha_composite(img, glow_layer2)
+        mask_draw.text((x, pad), ch, fill=255, font=font_title)
+        x += char_widths[i] + spacing
+
+    # Draw glow layers: purple glow (outer), then second glow pass (tighter)
+    glow_tile = Image.new('RGBA', tile_size, PURPLE)
+    glow_tile.putalpha(glyph_mask)
+    for blur_radius, alpha in ((30, 100), (12, 140)):
+        glow_layer = glow_tile.filter(ImageFilter.GaussianBlur(radius=blur_radius))
+        blit_over(canvas, glow_layer, title_x - pad, title_y - pad, opacity=alpha / 255)
 
     # Main text
-    main_draw = ImageDraw.Draw(img)
-    x = title_x
-    for i, ch in enumerate(title_text):
-        main_draw.text((x, title_y), ch, fill=TEXT_CLR, font=font_title)
-        x += char_widths[i] + (spacing if i < len(title_text) - 1 else 0)
+    text_tile = Image.new('RGBA', tile_size, TEXT_CLR)
+    text_tile.putalpha(glyph_mask)
+    blit_over(canvas, text_tile, title_x - pad, title_y - pad)
 
     # Tagline
     tag_size = 36  # ~12px * 3x
-    try:
-        font_tag = ImageFont.truetype(FONT_REG, tag_size)
-    except:
-        font_tag = ImageFont.load_default()
+    font_tag = load_font(FONT_REG, tag_size)
 
     tag_text = "FOCUS  \u00b7  GROW  \u00b7  COLLECT"
     tag_bbox = font_tag.getbbox(tag_text)
@@ -196,45 +228,47 @@ def draw_text(img, below_icon_y):
     tag_x = (W - tag_w) // 2
     tag_y = title_y + th + 36  # 12px * 3x gap
 
-    main_draw.text((tag_x, tag_y), tag_text, fill=(*TAG_CLR, 153), font=font_tag)
+    tag_tile = Image.new('RGBA', (tag_bbox[2], tag_bbox[3]), (0, 0, 0, 0))
+    ImageDraw.Draw(tag_tile).text((0, 0), tag_text, fill=(*TAG_CLR, 153), font=font_tag)
+    blit_over(canvas, tag_tile, tag_x, tag_y)
 
-    return img, tag_y + (tag_bbox[3] - tag_bbox[1])
+    return tag_y + (tag_bbox[3] - tag_bbox[1])
 
 
-def draw_loading_bar(img, below_tag_y):
+def draw_loading_bar(canvas, below_tag_y):
     """Draw the loading bar track and fill."""
-    draw = ImageDraw.Draw(img)
-
     bar_w = 540  # 180px * 3x
     bar_h = 18   # 6px * 3x
     bar_x = (W - bar_w) // 2
     bar_y = below_tag_y + 120  # 40px * 3x gap
 
+    track = Image.new('RGBA', (bar_w + 1, bar_h + 1), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(track)
+
     # Track background
     draw.rounded_rectangle(
-        (bar_x, bar_y, bar_x + bar_w, bar_y + bar_h),
+        (0, 0, bar_w, bar_h),
         radius=9,
         fill=(255, 255, 255, 20)  # rgba(255,255,255,0.08)
     )
 
     # Track border
     draw.rounded_rectangle(
-        (bar_x, bar_y, bar_x + bar_w, bar_y + bar_h),
+        (0, 0, bar_w, bar_h),
         radius=9,
         outline=(*PURPLE, 51),  # rgba(168,85,247,0.2)
         width=2
     )
+    blit_over(canvas, track, bar_x, bar_y)
 
     # Fill (~30%)
     fill_w = int(bar_w * 0.3)
 
     # Gradient fill
-    fill_img = Image.new('RGBA', (fill_w, bar_h), (0, 0, 0, 0))
-    fill_draw = ImageDraw.Draw(fill_img)
-    for x in range(fill_w):
-        t = x / fill_w
-        color = lerp_color(PURPLE, PURPLE_LT, t)
-        fill_draw.line([(x, 0), (x, bar_h)], fill=(*color, 255))
+    t = np.arange(fill_w, dtype=np.float32) / fill_w
+    fill_arr = np.full((bar_h, fill_w, 4), 255, dtype=np.uint8)
+    fill_arr[..., :3] = lerp_color(PURPLE, PURPLE_LT, t).astype(np.uint8)
+    fill_img = Image.fromarray(fill_arr, 'RGBA')
 
     # Round the fill
     fill_mask = Image.new('L', (fill_w, bar_h), 0)
@@ -242,67 +276,104 @@ def draw_loading_bar(img, below_tag_y):
     fm_draw.rounded_rectangle((0, 0, fill_w, bar_h), radius=9, fill=255)
     fill_img.putalpha(fill_mask)
 
-    # Glow on the fill
-    glow = fill_img.copy().filter(ImageFilter.GaussianBlur(radius=8))
-    img.paste(Image.alpha_composite(
-        img.crop((bar_x, bar_y - 10, bar_x + fill_w, bar_y + bar_h + 10)).convert('RGBA').resize((fill_w, bar_h + 20)),
-        glow.resize((fill_w, bar_h + 20)) if fill_w > 0 else glow
-    ), (bar_x, bar_y - 10))
+    # Glow on the fill: solid purple tile masked by the rounded fill, padded
+    # on all sides so the blur fades out before the tile edge
+    glow_blur = 8
+    pad = 3 * glow_blur
+    glow_mask = Image.new('L', (fill_w + 2 * pad, bar_h + 2 * pad), 0)
+    glow_mask.paste(fill_mask, (pad, pad))
+    glow = Image.new('RGBA', glow_mask.size, PURPLE)
+    glow.putalpha(glow_mask)
+    glow = glow.filter(ImageFilter.GaussianBlur(radius=glow_blur))
+    blit_over(canvas, glow, bar_x + 2 - pad, bar_y + 1 - pad)
+
+    blit_over(canvas, fill_img, bar_x + 2, bar_y + 1)
+
+
+def cache_key(png_options):
+    """Hash every input that affects the generated splash images."""
+    digest = hashlib.sha256()
+    for path in (os.path.abspath(__file__), ICON_PATH, FONT_BOLD, FONT_REG):
+        try:
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+        except OSError:
+            digest.update(b'missing')
+    digest.update(repr(sorted(png_options.items())).encode())
+    return digest.hexdigest()
+
+
+def is_up_to_date(key):
+    """True if the outputs exist and were generated from the same inputs."""
+    if not all(os.path.exists(os.path.join(OUT_DIR, name)) for name in OUT_FILES):
+        return False
+    try:
+        with open(CACHE_KEY_PATH) as f:
+            return f.read().strip() == key
+    except OSError:
+        return False
 
-    img.paste(fill_img, (bar_x + 2, bar_y + 1), fill_img)
 
-    return img
+def main():
+    optimize = os.environ.get('SPLASH_OPTIMIZE', '').strip().lower()
+    if optimize in ('1', 'true', 'yes', 'on'):
+        png_options = {'optimize': True}
+    else:
+        png_options = {'compress_level': 1}
 
+    key = cache_key(png_options)
+    if is_up_to_date(key):
+        print(f"Splash unchanged, skipping. Output: {OUT_DIR}")
+        return
 
-def main():
     print(f"Generating splash image {W}x{H}...")
 
-    # Start with gradient background
-    img = Image.new('RGB', (W, H), BG_TOP)
-    draw_gradient(img)
-    img = img.convert('RGBA')
+    # Start with gradient background; every element is composited onto
+    # this single RGB canvas within its own bounding box
+    canvas = draw_gradient()
 
     # Add glow
-    img = draw_glow(img)
+    draw_glow(canvas)
 
     # Add scanlines
-    img = draw_scanlines(img)
+    draw_scanlines(canvas)
 
     # Add icon
-    img, below_icon = draw_icon(img)
+    below_icon = draw_icon(canvas)
 
     # Add text
-    img, below_tag = draw_text(img, below_icon)
+    below_tag = draw_text(canvas, below_icon)
 
     # Add loading bar
-    img = draw_loading_bar(img, below_tag)
+    draw_loading_bar(canvas, below_tag)
 
-    # Convert to RGB for PNG output (no alpha needed)
-    img = img.convert('RGB')
+    img = Image.fromarray(canvas, 'RGB')
 
-    # Output directory
-    out_dir = os.path.join(
-        PROJECT_ROOT, 'ios', 'App', 'App',
-        'Assets.xcassets', 'LaunchSplash.imageset'
-    )
-    os.makedirs(out_dir, exist_ok=True)
-
-    # Save at 3 scales
-    # 3x = full res (1290x2796)
-    img.save(os.path.join(out_dir, 'splash-3x.png'), 'PNG', optimize=True)
-    print(f"  3x: {W}x{H}")
-
-    # 2x = 860x1864
-    w2, h2 = W * 2 // 3, H * 2 // 3
-    img2 = img.resize((w2, h2), Image.LANCZOS)
-    img2.save(os.path.join(out_dir, 'splash-2x.png'), 'PNG', optimize=True)
-    print(f"  2x: {w2}x{h2}")
-
-    # 1x = 430x932
-    w1, h1 = W // 3, H // 3
-    img1 = img.resize((w1, h1), Image.LANCZOS)
-    img1.save(os.path.join(out_dir, 'splash-1x.png'), 'PNG', optimize=True)
-    print(f"  1x: {w1}x{h1}")
+    os.makedirs(OUT_DIR, exist_ok=True)
+    # Invalidate the old key before touching any output, so an interrupted
+    # run can't leave mixed renders that look up to date
+    try:
+        os.remove(CACHE_KEY_PATH)
+    except FileNotFoundError:
+        pass
+
+    # Save at 3 scales: 3x = full res (1290x2796), 2x = 860x1864, 1x = 430x932.
+    # PNG encodes run in worker threads (zlib releases the GIL) while the
+    # next scale is resized. 1x is derived from 2x, where BILINEAR is
+    # indistinguishable from LANCZOS at half the source pixels.
+    def save_scale(scaled, scale):
+        scaled.save(os.path.join(OUT_DIR, f'splash-{scale}x.png'), 'PNG', **png_options)
+        return scale, scaled.size
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        jobs = [pool.submit(save_scale, img, 3)]
+        img2 = img.resize((W * 2 // 3, H * 2 // 3), Image.LANCZOS)
+        jobs.append(pool.submit(save_scale, img2, 2))
+        img1 = img2.resize((W // 3, H // 3), Image.BILINEAR)
+        jobs.append(pool.submit(save_scale, img1, 1))
+        for job in jobs:
+            scale, (w, h) = job.result()
+            print(f"  {scale}x: {w}x{h}")
 
     # Write Contents.json
     contents = """{
@@ -328,10 +399,13 @@ def main():
     "author": "xcode"
   }
 }"""
-    with open(os.path.join(out_dir, 'Contents.json'), 'w') as f:
+    with open(os.path.join(OUT_DIR, 'Contents.json'), 'w') as f:
         f.write(contents)
 
-    print(f"Done! Output: {out_dir}")
+    with open(CACHE_KEY_PATH, 'w') as f:
+        f.write(key + '\n')
+
+    print(f"Done! Output: {OUT_DIR}")
 
 
 if __name__ == '__main__':